@@ -2,7 +2,12 @@ import streamlit as st
 from streamlit.components.v1 import html
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from snapfit_kernels import (
+    RECTANGLE, TRAPEZOID, RING_SEGMENT,
+    mating_force_ratio, snapfit_cached, deflection_rect,
+)
 
 # ======================================================
 # PAGE CONFIG + CENTERING STYLE
@@ -47,16 +52,28 @@ length_unit = "in" if unit_system == "Imperial" else "mm"
 E_unit = "psi" if unit_system == "Imperial" else "Pa"
 force_unit = "lbf" if unit_system == "Imperial" else "N"
 
+def unit_for(key):
+    return force_unit if "Force" in key else length_unit if "Deflection" in key else ""
+
 # ======================================================
 # CONVERSIONS
 # ======================================================
 
-def in_to_mm(val): return val * 25.4
-def mm_to_in(val): return val / 25.4
-def lbf_to_N(val): return val * 4.44822
-def N_to_lbf(val): return val / 4.44822
-def psi_to_Pa(val): return val * 6894.76
-def Pa_to_psi(val): return val / 6894.76
+MM_PER_IN = 25.4
+N_PER_LBF = 4.44822
+PA_PER_PSI = 6894.76
+
+# Reciprocals precomputed so conversions multiply instead of divide
+_INV_MM_PER_IN = 1.0 / MM_PER_IN
+_INV_N_PER_LBF = 1.0 / N_PER_LBF
+_INV_PA_PER_PSI = 1.0 / PA_PER_PSI
+
+def in_to_mm(val): return val * MM_PER_IN
+def mm_to_in(val): return val * _INV_MM_PER_IN
+def lbf_to_N(val): return val * N_PER_LBF
+def N_to_lbf(val): return val * _INV_N_PER_LBF
+def psi_to_Pa(val): return val * PA_PER_PSI
+def Pa_to_psi(val): return val * _INV_PA_PER_PSI
 
 # ======================================================
 # GEOMETRY FACTORS
@@ -81,28 +98,68 @@ PROFILE_FACTORS = {
 # CALCULATION ENGINE
 # ======================================================
 
+PROFILE_NAMES = tuple(PROFILE_FACTORS)
+PROFILE_IDS = {name: i for i, name in enumerate(PROFILE_NAMES)}
+
+# Profile kind (RECTANGLE, TRAPEZOID, ...) per entry of PROFILE_NAMES
+PROFILE_KIND = np.array([0,0,0,1,1,1,2,2,2,3,3,3], dtype=np.int8)
+_FACTOR_ARR = np.array([PROFILE_FACTORS[name] for name in PROFILE_NAMES], dtype=np.float64)
+
 def calculate_snap_fit(profile, E, eps, L, h=None, b=None, a=None, r2=None, Z=None, mu=0.3, alpha_deg=5):
-    alpha = np.radians(alpha_deg)
-    factor = PROFILE_FACTORS[profile]
-
-    if "Rectangle" in profile:
-        y = factor * eps * L**2 / h
-        Z_sec = b * h**2 / 6
-    elif "Trapezoid" in profile:
-        y = factor * ((a + b) / (2*a + b)) * eps * L**2 / h
-        Z_sec = (h**2 / 12) * ((a**2 + 4*a*b + b**2) / (2*a + b))
-    elif "Ring Segment" in profile:
-        y = factor * eps * L**2 / r2
-        Z_sec = Z
-    else:  # Irregular
-        y = factor * eps * L**2 / h
-        Z_sec = Z
-
-    P = Z_sec * E * eps / L
-    W = P * ((mu + np.tan(alpha)) / (1 - mu * np.tan(alpha)))
+    # All-float key so unit toggles and tab switches hit snapfit_cached
+    pid = PROFILE_IDS[profile]
+    y, P, W = snapfit_cached(
+        int(PROFILE_KIND[pid]), float(E), float(eps), float(L),
+        float(h or 0.0), float(b or 0.0), float(a or 0.0), float(r2 or 0.0), float(Z or 0.0),
+        float(_FACTOR_ARR[pid]), mating_force_ratio(float(mu), float(alpha_deg))
+    )
 
     return {"Permissible Deflection (y)": y, "Deflection Force (P)": P, "Mating Force (W)": W}
 
+# ======================================================
+# PARAMETRIC SWEEP
+# ======================================================
+
+def _rect_sweep(vals, which, h, L, eps, b, E, ratio):
+    # Broadcast the swept parameter through the rectangle formulas in one shot
+    h_arr = np.broadcast_to(vals if which=="Thickness h" else h, vals.shape)
+    L_arr = np.broadcast_to(vals if which=="Length L" else L, vals.shape)
+    eps_arr = np.broadcast_to(vals if which=="Allowable Strain ε" else eps, vals.shape)
+    factor = _FACTOR_ARR[PROFILE_IDS["Rectangle – Constant Cross Section"]]
+
+    Z_sec = b * h_arr**2 / 6
+    y = deflection_rect(factor, eps_arr, L_arr, h_arr)
+    P = Z_sec * E * eps_arr / L_arr
+    W = P * ratio
+    return y, P, W
+
+SWEEP_COLUMNS = ["Sweep Value", "Permissible Deflection (y)", "Deflection Force (P)", "Mating Force (W)"]
+
+@st.cache_data
+def run_sweep(sweep_param, start, stop, steps, mu, alpha, E, h0, L0, b0):
+    # Primitive args only so reruns with unchanged inputs hit the cache
+    vals = np.linspace(start, stop, steps)
+    # μ and α are fixed across the sweep, so the W/P ratio is computed once
+    ratio = mating_force_ratio(float(mu), float(alpha))
+    y, P, W = _rect_sweep(vals, sweep_param, h0, L0, 0.02, b0, E, ratio)
+
+    # One contiguous block for all columns, wrapped by pandas without copying
+    buf = np.empty((steps, len(SWEEP_COLUMNS)))
+    buf[:, 0] = vals
+    buf[:, 1] = y
+    buf[:, 2] = P
+    buf[:, 3] = W
+    return pd.DataFrame(buf, columns=SWEEP_COLUMNS, copy=False)
+
+def _get_fig():
+    # One Figure per browser session, reused across that session's reruns;
+    # callers clear the axes before plotting. Built with Figure() rather than
+    # plt.subplots so it stays out of pyplot's global (non-thread-safe) registry
+    if 'param_fig' not in st.session_state:
+        fig = Figure(figsize=(5,3))
+        st.session_state['param_fig'] = (fig, fig.subplots())
+    return st.session_state['param_fig']
+
 # ======================================================
 # DEFAULT INPUTS
 # ======================================================
@@ -140,44 +197,61 @@ with tab_calc:
 
     with col_in:
         st.subheader("Inputs")
-        profile = st.selectbox("Geometric Profile", list(PROFILE_FACTORS.keys()))
-        st.markdown("**Material**")
-        E = st.number_input(f"Elastic Modulus [{E_unit}]", value=defaults["E"])
-        eps = st.number_input("Allowable Strain ε [-]", value=0.02)
-        st.markdown("**Contact**")
-        mu = st.number_input("Coefficient of Friction μ [-]", value=0.30)
-        alpha = st.number_input("Lead-in Angle α (deg)", value=5.0)
-        st.divider()
-        st.markdown("**Geometry**")
-        L = st.number_input(f"Cantilever Length [{length_unit}]", value=defaults["L"])
-        h = b = a = r2 = Z = None
-
-        if "Rectangle" in profile:
-            h = st.number_input(f"Thickness h [{length_unit}]", value=defaults["h"])
-            b = st.number_input(f"Width b [{length_unit}]", value=defaults["b"])
-        elif "Trapezoid" in profile:
-            h = st.number_input(f"Root Thickness h [{length_unit}]", value=defaults["h"])
-            a = st.number_input(f"Root Width a [{length_unit}]", value=defaults["a"])
-            b = st.number_input(f"Tip Width b [{length_unit}]", value=defaults["b"])
-        elif "Ring Segment" in profile:
-            r2 = st.number_input(f"Outer Radius r₂ [{length_unit}]", value=defaults["r2"])
-            Z = st.number_input(f"Section Modulus Z [{'in³' if unit_system == 'Imperial' else 'm³'}]", value=defaults["Z"])
-        else:
-            h = st.number_input(f"Effective Thickness h [{length_unit}]", value=defaults["h"])
-            Z = st.number_input(f"Section Modulus Z [{'in³' if unit_system == 'Imperial' else 'm³'}]", value=defaults["Z"])
-
-        results = calculate_snap_fit(profile, E, eps, L, h=h, b=b, a=a, r2=r2, Z=Z, mu=mu, alpha_deg=alpha)
-
-        if unit_system == "Metric":
-            results["Permissible Deflection (y)"] *= 25.4
-            results["Deflection Force (P)"] *= 4.44822
-            results["Mating Force (W)"] *= 4.44822
+        profile = st.selectbox("Geometric Profile", PROFILE_NAMES)
+        # Inputs are batched in a form so editing several fields triggers a
+        # single rerun; the profile stays outside since it picks the fields
+        with st.form("calc_form"):
+            st.markdown("**Material**")
+            E = st.number_input(f"Elastic Modulus [{E_unit}]", value=defaults["E"])
+            eps = st.number_input("Allowable Strain ε [-]", value=0.02)
+            st.markdown("**Contact**")
+            mu = st.number_input("Coefficient of Friction μ [-]", value=0.30)
+            alpha = st.number_input("Lead-in Angle α (deg)", value=5.0)
+            st.divider()
+            st.markdown("**Geometry**")
+            L = st.number_input(f"Cantilever Length [{length_unit}]", value=defaults["L"])
+            h = b = a = r2 = Z = None
+            kind = PROFILE_KIND[PROFILE_IDS[profile]]
+
+            if kind == RECTANGLE:
+                h = st.number_input(f"Thickness h [{length_unit}]", value=defaults["h"])
+                b = st.number_input(f"Width b [{length_unit}]", value=defaults["b"])
+            elif kind == TRAPEZOID:
+                h = st.number_input(f"Root Thickness h [{length_unit}]", value=defaults["h"])
+                a = st.number_input(f"Root Width a [{length_unit}]", value=defaults["a"])
+                b = st.number_input(f"Tip Width b [{length_unit}]", value=defaults["b"])
+            elif kind == RING_SEGMENT:
+                r2 = st.number_input(f"Outer Radius r₂ [{length_unit}]", value=defaults["r2"])
+                Z = st.number_input(f"Section Modulus Z [{'in³' if unit_system == 'Imperial' else 'm³'}]", value=defaults["Z"])
+            else:
+                h = st.number_input(f"Effective Thickness h [{length_unit}]", value=defaults["h"])
+                Z = st.number_input(f"Section Modulus Z [{'in³' if unit_system == 'Imperial' else 'm³'}]", value=defaults["Z"])
+
+            submitted = st.form_submit_button("Compute")
+
+        # Recompute on submit, or when a new profile or unit system swaps the
+        # input fields; otherwise show the last result
+        calc_key = (unit_system, profile)
+        if submitted or st.session_state.get('calc_key') != calc_key:
+            results = calculate_snap_fit(profile, E, eps, L, h=h, b=b, a=a, r2=r2, Z=Z, mu=mu, alpha_deg=alpha)
+
+            if unit_system == "Metric":
+                # y, P, W scaled in one broadcast
+                scaled = np.array(list(results.values())) * np.array([MM_PER_IN, N_PER_LBF, N_PER_LBF])
+                results = dict(zip(results, scaled))
+
+            st.session_state['calc_results'] = results
+            st.session_state['calc_key'] = calc_key
+
+        results = st.session_state['calc_results']
 
     with col_out:
         st.subheader("Outputs")
-        for k, v in results.items():
-            unit_label = force_unit if "Force" in k else length_unit if "Deflection" in k else ""
-            st.markdown(f"<div class='calculator-output'><strong>{k}:</strong><br>{v:.4f} {unit_label}</div>", unsafe_allow_html=True)
+        html_out = "".join(
+            f"<div class='calculator-output'><strong>{k}:</strong><br>{v:.4f} {unit_for(k)}</div>"
+            for k, v in results.items()
+        )
+        st.markdown(html_out, unsafe_allow_html=True)
 
 # ======================================================
 # PARAMETRIC STUDY TAB
@@ -194,56 +268,60 @@ with tab_param:
 
     col_inputs, col_chart = st.columns([1,1])
 
+    # Sweep inputs live in a form so the sweep only runs on "Run sweep",
+    # not on every keystroke elsewhere in the app; the swept parameter stays
+    # outside since it picks the Start/Stop labels and defaults
     with col_inputs:
         sweep_param = st.selectbox("Parameter to Sweep", ["Thickness h", "Length L", "Allowable Strain ε"])
-        start_default = defaults["h"] if sweep_param=="Thickness h" else defaults["L"] if sweep_param=="Length L" else 0.01
-        stop_default = defaults["h"]*3 if sweep_param=="Thickness h" else defaults["L"]*3 if sweep_param=="Length L" else 0.05
-        start = st.number_input(f"Start [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]", value=start_default)
-        stop = st.number_input(f"Stop [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]", value=stop_default)
-        steps = st.slider("Steps", 5, 50, 20)
-
-    vals = np.linspace(start, stop, steps)
-    rows = []
-
-    for v in vals:
-        h_s, L_s, eps_s = defaults["h"], defaults["L"], 0.02
-        if sweep_param=="Thickness h": h_s=v
-        elif sweep_param=="Length L": L_s=v
-        else: eps_s=v
-
-        res = calculate_snap_fit("Rectangle – Constant Cross Section", defaults["E"], eps_s, L_s, h=h_s, b=defaults["b"], mu=mu, alpha_deg=alpha)
-        rows.append({"Sweep Value": v, **res})
-
-    df = pd.DataFrame(rows)
-
-    # Store df in session state for dynamic unit switching
-    st.session_state['param_df'] = df.copy()
-
-    # Apply unit conversion dynamically
-    df_plot = df.copy()
-    if unit_system=="Metric":
-        if sweep_param != "Allowable Strain ε":
-            df_plot["Sweep Value"] = df_plot["Sweep Value"] * 25.4
-        df_plot["Deflection Force (P)"] *= 4.44822
-        df_plot["Mating Force (W)"] *= 4.44822
-        df_plot["Permissible Deflection (y)"] *= 25.4
+        with st.form("sweep_form"):
+            start_default = defaults["h"] if sweep_param=="Thickness h" else defaults["L"] if sweep_param=="Length L" else 0.01
+            stop_default = defaults["h"]*3 if sweep_param=="Thickness h" else defaults["L"]*3 if sweep_param=="Length L" else 0.05
+            start = st.number_input(f"Start [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]", value=start_default)
+            stop = st.number_input(f"Stop [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]", value=stop_default)
+            steps = st.slider("Steps", 5, 50, 20)
+            submitted = st.form_submit_button("Run sweep")
+
+    # Store df in session state for dynamic unit switching; only replace it
+    # when the sweep inputs actually changed
+    key = (sweep_param, start, stop, steps, mu, alpha, unit_system)
+    stored_key = st.session_state.get('param_key')
+    # Only start/stop/steps wait for "Run sweep". A new sweep parameter or unit
+    # system swaps the Start/Stop fields and defaults, and μ/α only change
+    # through a calc_form submit, so any of those recompute right away
+    fields_changed = stored_key is not None and (stored_key[0],) + stored_key[4:] != (sweep_param, mu, alpha, unit_system)
+    if (submitted or fields_changed) and stored_key != key:
+        st.session_state['param_df'] = run_sweep(sweep_param, start, stop, steps, mu, alpha, defaults["E"], defaults["h"], defaults["L"], defaults["b"])
+        st.session_state['param_key'] = key
+
+    df = st.session_state['param_df']
+
+    if df is None:
+        with col_chart:
+            st.info("Set the sweep range and press **Run sweep**.")
     else:
-        if sweep_param != "Allowable Strain ε":
-            df_plot["Sweep Value"] = df_plot["Sweep Value"] / 25.4
-        df_plot["Deflection Force (P)"] = df_plot["Deflection Force (P)"].apply(N_to_lbf)
-        df_plot["Mating Force (W)"] = df_plot["Mating Force (W)"].apply(N_to_lbf)
-        df_plot["Permissible Deflection (y)"] = df_plot["Permissible Deflection (y)"].apply(mm_to_in)
-
-    with col_chart:
-        fig, ax = plt.subplots(figsize=(5,3))
-        ax.plot(df_plot["Sweep Value"], df_plot["Deflection Force (P)"], label="Deflection Force P")
-        ax.plot(df_plot["Sweep Value"], df_plot["Mating Force (W)"], label="Mating Force W")
-        ax.set_xlabel(f"{sweep_param} [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]")
-        ax.set_ylabel(f"Force [{force_unit}]")
-        ax.set_title("Parametric Study: Forces vs Sweep Value")
-        ax.legend()
-        st.pyplot(fig)
-        st.dataframe(df_plot, use_container_width=True)
+        # Apply unit conversion dynamically
+        if unit_system=="Metric":
+            length_scale, force_scale = MM_PER_IN, N_PER_LBF
+        else:
+            length_scale, force_scale = _INV_MM_PER_IN, _INV_N_PER_LBF
+        sweep_scale = 1.0 if sweep_param == "Allowable Strain ε" else length_scale
+
+        # Scale all columns in a single broadcast pass (no df.copy())
+        scale = np.array([sweep_scale, length_scale, force_scale, force_scale])
+        df_plot = pd.DataFrame(df[SWEEP_COLUMNS].to_numpy() * scale, columns=SWEEP_COLUMNS)
+
+        with col_chart:
+            fig, ax = _get_fig()
+            ax.cla()
+            ax.plot(df_plot["Sweep Value"], df_plot["Deflection Force (P)"], label="Deflection Force P")
+            ax.plot(df_plot["Sweep Value"], df_plot["Mating Force (W)"], label="Mating Force W")
+            ax.set_xlabel(f"{sweep_param} [{length_unit if 'h' in sweep_param or 'L' in sweep_param else ''}]")
+            ax.set_ylabel(f"Force [{force_unit}]")
+            ax.set_title("Parametric Study: Forces vs Sweep Value")
+            ax.legend()
+            st.pyplot(fig, clear_figure=False)
+            # Static table: at most 50 rows that never need sorting or scrolling widgets
+            st.table(df_plot)
 
 # ======================================================
 # EQUATIONS TAB
@@ -0,0 +1,70 @@
+import functools
+import math
+import threading
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # numba is optional; fall back to plain Python / NumPy
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    # The ufunc bodies are plain arithmetic, so they broadcast as NumPy expressions
+    def vectorize(*args, **kwargs):
+        return lambda func: func
+
+# ======================================================
+# NUMERIC KERNELS
+# ======================================================
+# Kept out of SnapFitCalc.py because Streamlit re-executes that script on
+# every rerun; this module is imported (and JIT-compiled) once per process.
+
+# Profile kinds, in the same order as PROFILE_NAMES (three variants each)
+RECTANGLE, TRAPEZOID, RING_SEGMENT, IRREGULAR = range(4)
+
+@njit(cache=True)
+def mating_force_ratio(mu, alpha_deg):
+    # W/P ratio; constant for a given μ and α
+    t = math.tan(math.radians(alpha_deg))
+    return (mu + t) / (1.0 - mu * t)
+
+@njit(cache=True, fastmath=True)
+def snapfit_core(kind, E, eps, L, h, b, a, r2, Z, factor, ratio):
+    if kind == RECTANGLE:
+        y = factor * eps * L * L / h
+        Z_sec = b * h * h / 6.0
+    elif kind == TRAPEZOID:
+        y = factor * ((a + b) / (2.0*a + b)) * eps * L * L / h
+        Z_sec = (h * h / 12.0) * ((a*a + 4.0*a*b + b*b) / (2.0*a + b))
+    elif kind == RING_SEGMENT:
+        y = factor * eps * L * L / r2
+        Z_sec = Z
+    else:  # Irregular
+        y = factor * eps * L * L / h
+        Z_sec = Z
+
+    P = Z_sec * E * eps / L
+    W = P * ratio
+    return y, P, W
+
+# Lives here rather than in the Streamlit script so the cache survives reruns
+@functools.lru_cache(maxsize=256)
+def snapfit_cached(kind, E, eps, L, h, b, a, r2, Z, factor, ratio):
+    return snapfit_core(kind, E, eps, L, h, b, a, r2, Z, factor, ratio)
+
+# Sweeps are at most a few dozen points, so a single-threaded ufunc beats
+# spinning up the parallel thread pool
+@vectorize(['f8(f8,f8,f8,f8)'], nopython=True, target='cpu', cache=True)
+def deflection_rect(factor, eps, L, h):
+    return factor * eps * L * L / h
+
+def _warm_kernels():
+    try:
+        snapfit_core(RECTANGLE, 1.0, 0.02, 1.0, 0.1, 0.5, 0.6, 0.5, 1e-6, 0.67, mating_force_ratio(0.3, 5.0))
+    except Exception:
+        pass  # warm-up is best effort; a real call will compile on demand
+
+# Compile in the background once per process at import so the first
+# calculation doesn't stall; cache=True reloads it from __pycache__/
+threading.Thread(target=_warm_kernels, daemon=True).start()